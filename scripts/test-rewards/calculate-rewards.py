@@ -1,128 +1,398 @@
 import json
-from typing import Dict, List, Any, Tuple
-from collections import defaultdict
+from typing import Dict, List, Any, Optional, Tuple, Union
+from collections import defaultdict, namedtuple
 from decimal import Decimal, ROUND_HALF_UP
+from functools import lru_cache
+
+# Reward amounts are Decimal on the exact path and float on the default path
+Number = Union[Decimal, float]
+
+# Shared output quantum so quantize never rebuilds its argument per entry
+_CENT = Decimal("0.01")
+
+
+@lru_cache(maxsize=4096)
+def _dec(value="0") -> Decimal:
+    """Interned Decimal construction — generated scenarios repeat the same
+    amount strings constantly, and Decimals are immutable so sharing is safe."""
+    return Decimal(value)
+
+try:
+    import numpy as np
+except ImportError:  # the pure-Python path below works without it
+    np = None
+
+try:
+    import orjson
+except ImportError:  # stdlib json is the (slower) fallback
+    orjson = None
+
+try:
+    from numba import njit
+except ImportError:  # NumPy/pure-Python paths below work without it
+    njit = None
+
+if njit is not None:
+    @njit(cache=True, fastmath=True)
+    def _direct_rewards_kernel(power, proposal_idx, user_idx, total_power,
+                               tribute_amount, tribute_denom, tribute_offsets,
+                               commission_factor, out):
+        """Scatter each user vessel's tribute shares into out[user, denom].
+
+        Tributes are stored CSR-style: proposal p owns rows
+        tribute_offsets[p]..tribute_offsets[p+1] of the tribute arrays."""
+        for r in range(power.shape[0]):
+            p = proposal_idx[r]
+            total = total_power[p]
+            if total <= 0.0:
+                continue
+            share = power[r] / total * commission_factor
+            for t in range(tribute_offsets[p], tribute_offsets[p + 1]):
+                out[user_idx[r], tribute_denom[t]] += share * tribute_amount[t]
+
+    @njit(cache=True, fastmath=True)
+    def _delegated_rewards_kernel(tribute_amount, tribute_denom, tribute_proposal,
+                                  proposal_factor, proposal_threshold_row,
+                                  user_share_by_threshold, out):
+        """Distribute each tribute's delegated pot across eligible users.
+
+        proposal_factor folds hydromancer share and both commissions;
+        user_share_by_threshold[k, u] is user u's fraction of the eligible
+        power at duration-threshold row k."""
+        n_users = user_share_by_threshold.shape[1]
+        for t in range(tribute_amount.shape[0]):
+            p = tribute_proposal[t]
+            factor = proposal_factor[p]
+            if factor == 0.0:
+                continue
+            pot = tribute_amount[t] * factor
+            k = proposal_threshold_row[p]
+            d = tribute_denom[t]
+            for u in range(n_users):
+                share = user_share_by_threshold[k, u]
+                if share != 0.0:
+                    out[u, d] += pot * share
+else:
+    _direct_rewards_kernel = None
+    _delegated_rewards_kernel = None
+
+# Every per-proposal view the reward passes need, built in a single walk of
+# scenario["users"]. Vessel lists hold (user_id, vessel, voting_power)
+# tuples so no vessel dict is ever copied.
+ScenarioIndex = namedtuple("ScenarioIndex", [
+    "vessels_by_proposal",
+    "hydromancer_power_by_proposal",
+    "user_power_by_proposal",
+    "total_power_by_proposal",
+    "user_vessels_by_proposal",
+])
+
+# Scenario-level commission rates plus their net-of-commission factors,
+# parsed out of protocol_config once per calculation
+CommissionRates = namedtuple("CommissionRates", [
+    "protocol",
+    "hydromancer",
+    "net_protocol",
+    "net_hydromancer",
+])
+
+# Flat structure-of-arrays view of every voting vessel, one row per vessel,
+# so power sums and eligibility aggregations become single NumPy reductions.
+VectorizedScenario = namedtuple("VectorizedScenario", [
+    "power",                  # float64[N]: amount * token_mult * duration_mult
+    "proposal_idx",           # int64[N]: position in proposal_ids
+    "user_idx",               # int64[N]: position in user_ids
+    "duration",               # int64[N]: lock_duration_rounds
+    "is_hydromancer",         # bool[N]
+    "vessels",                # list[N]: the vessel dict behind each row
+    "proposal_ids",           # original proposal id per proposal_idx value
+    "user_ids",               # original user id per user_idx value
+    "user_rows_by_proposal",  # proposal id -> int64 row indices of user-controlled vessels
+])
 
 class RewardsCalculator:
-    def __init__(self):
+    def __init__(self, exact: bool = False):
+        # All intermediate arithmetic runs on native floats by default —
+        # Decimal is ~30-100x slower per operation and we only quantize to
+        # 2 decimals at output anyway. Pass exact=True to keep the full
+        # Decimal pipeline for regression comparisons.
+        self.exact = exact
+        self._num = _dec if exact else float
+
         # Token multipliers for voting power (only applies to vessel tokens: stATOM and dATOM)
         self.token_multipliers = {
-            "dATOM": Decimal("1.3"),
-            "stATOM": Decimal("1.6"),
+            "dATOM": self._num("1.3"),
+            "stATOM": self._num("1.6"),
         }
-        
+
         # Duration multipliers for voting power
         self.duration_multipliers = {
-            1: Decimal("1.0"),
-            2: Decimal("1.25"),
-            3: Decimal("1.5")
+            1: self._num("1.0"),
+            2: self._num("1.25"),
+            3: self._num("1.5")
         }
-        
+
+        # Precomputed token * duration products — only 6 combinations exist,
+        # so voting power needs one lookup and one multiply
+        self._combined_multipliers = {
+            (denom, duration): token_multiplier * duration_multiplier
+            for denom, token_multiplier in self.token_multipliers.items()
+            for duration, duration_multiplier in self.duration_multipliers.items()
+        }
+
         # Note: Vessels can only contain stATOM or dATOM
         # Tributes can contain any token (dATOM, stATOM, USDC, NTRN, etc.)
-    
-    def calculate_voting_power(self, vessel: Dict[str, Any]) -> Decimal:
+
+        # Vectorized (NumPy) aggregation only makes sense on the float path
+        self._use_numpy = np is not None and not exact
+
+        # Per-scenario caches (keyed by id(scenario)) so the group-by and
+        # power aggregations run once per scenario instead of once per
+        # calling method
+        self._index_cache = {}
+        self._soa_cache = {}
+
+        # Voting-power cache keyed by the vessel fields that determine the
+        # result — the same vessel shows up in several reward passes
+        self._vp_cache = {}
+
+    def calculate_voting_power(self, vessel: Dict[str, Any]) -> Number:
         """Calculate the voting power of a vessel.
         Note: Vessels can only contain stATOM or dATOM tokens."""
-        amount = Decimal(vessel["locked_amount"])
         token_denom = vessel["locked_denom"]
         lock_duration = vessel["lock_duration_rounds"]
-        
-        # Apply token multiplier (should always exist since vessels only contain stATOM/dATOM)
+
+        cache_key = (vessel["id"], token_denom, vessel["locked_amount"], lock_duration)
+        cached = self._vp_cache.get(cache_key)
+        if cached is not None:
+            return cached
+
+        amount = self._num(vessel["locked_amount"])
+
+        # Token multiplier should always exist since vessels only contain stATOM/dATOM
         if token_denom not in self.token_multipliers:
             raise ValueError(f"Invalid vessel token: {token_denom}. Vessels can only contain stATOM or dATOM.")
-        
-        token_multiplier = self.token_multipliers[token_denom]
-        
-        # Apply duration multiplier
-        duration_multiplier = self.duration_multipliers[lock_duration]
-        
-        voting_power = amount * token_multiplier * duration_multiplier
+
+        # Combined token * duration multiplier, precomputed in __init__
+        voting_power = amount * self._combined_multipliers[(token_denom, lock_duration)]
+        self._vp_cache[cache_key] = voting_power
         return voting_power
     
-    def get_vessels_by_proposal(self, scenario: Dict[str, Any]) -> Dict[int, List[Dict]]:
-        """Group vessels by the proposal they voted for."""
-        vessels_by_proposal = defaultdict(list)
-        
+    def _vectorize(self, scenario: Dict[str, Any]) -> VectorizedScenario:
+        """Flatten every voting vessel into parallel NumPy arrays (cached per
+        scenario). The voting-power column is computed in one vector op."""
+        cached = self._soa_cache.get(id(scenario))
+        if cached is not None:
+            return cached
+
+        amounts = []
+        mults = []
+        proposal_idx = []
+        user_idx = []
+        durations = []
+        is_hydromancer = []
+        vessels = []
+        proposal_ids = []
+        proposal_pos = {}
+        user_ids = []
+        user_rows_by_proposal = defaultdict(list)
+
         for user in scenario["users"]:
+            u = len(user_ids)
+            user_ids.append(user["user_id"])
             for vessel in user["vessels"]:
-                if vessel["voted_proposal_id"] is not None:
-                    vessel_with_user = vessel.copy()
-                    vessel_with_user["user_id"] = user["user_id"]
-                    vessels_by_proposal[vessel["voted_proposal_id"]].append(vessel_with_user)
-        
-        return vessels_by_proposal
-    
-    def calculate_protocol_rewards(self, scenario: Dict[str, Any]) -> Dict[str, Decimal]:
+                proposal_id = vessel["voted_proposal_id"]
+                if proposal_id is None:
+                    continue
+
+                token_denom = vessel["locked_denom"]
+                if token_denom not in self.token_multipliers:
+                    raise ValueError(f"Invalid vessel token: {token_denom}. Vessels can only contain stATOM or dATOM.")
+
+                p = proposal_pos.setdefault(proposal_id, len(proposal_ids))
+                if p == len(proposal_ids):
+                    proposal_ids.append(proposal_id)
+
+                row = len(vessels)
+                duration = vessel["lock_duration_rounds"]
+                amounts.append(float(vessel["locked_amount"]))
+                mults.append(self._combined_multipliers[(token_denom, duration)])
+                proposal_idx.append(p)
+                user_idx.append(u)
+                durations.append(duration)
+                hydro = vessel["controlled_by"] == "hydromancer"
+                is_hydromancer.append(hydro)
+                vessels.append(vessel)
+                if not hydro:
+                    user_rows_by_proposal[proposal_id].append(row)
+
+        power = np.array(amounts, dtype=np.float64) * np.array(mults, dtype=np.float64)
+
+        soa = VectorizedScenario(
+            power=power,
+            proposal_idx=np.array(proposal_idx, dtype=np.int64),
+            user_idx=np.array(user_idx, dtype=np.int64),
+            duration=np.array(durations, dtype=np.int64),
+            is_hydromancer=np.array(is_hydromancer, dtype=bool),
+            vessels=vessels,
+            proposal_ids=proposal_ids,
+            user_ids=user_ids,
+            user_rows_by_proposal={
+                proposal_id: np.array(rows, dtype=np.int64)
+                for proposal_id, rows in user_rows_by_proposal.items()
+            },
+        )
+        self._soa_cache[id(scenario)] = soa
+        return soa
+
+    def _index_scenario(self, scenario: Dict[str, Any]) -> ScenarioIndex:
+        """Build every per-proposal view in one pass over the users (cached
+        per scenario): the vessel group-by plus the hydromancer/user/total
+        power sums and the user-controlled vessel split."""
+        cached = self._index_cache.get(id(scenario))
+        if cached is not None:
+            return cached
+
+        vessels_by_proposal = defaultdict(list)
+        user_vessels_by_proposal = defaultdict(list)
+        hydromancer_power_by_proposal = defaultdict(self._num)
+        user_power_by_proposal = defaultdict(self._num)
+        total_power_by_proposal = defaultdict(self._num)
+
+        if self._use_numpy:
+            # The power sums are bincount reductions over the SoA view; the
+            # entry lists just zip the row data back with the power column
+            soa = self._vectorize(scenario)
+            n_proposals = len(soa.proposal_ids)
+            hydro_mask = soa.is_hydromancer
+            # .tolist() hands back plain Python floats for the dicts
+            total = np.bincount(soa.proposal_idx, weights=soa.power, minlength=n_proposals).tolist()
+            hydro = np.bincount(soa.proposal_idx[hydro_mask], weights=soa.power[hydro_mask], minlength=n_proposals).tolist()
+
+            for p, proposal_id in enumerate(soa.proposal_ids):
+                total_power_by_proposal[proposal_id] = total[p]
+                if hydro[p]:
+                    hydromancer_power_by_proposal[proposal_id] = hydro[p]
+                if total[p] > hydro[p]:
+                    user_power_by_proposal[proposal_id] = total[p] - hydro[p]
+
+            powers = soa.power.tolist()
+            for row, vessel in enumerate(soa.vessels):
+                proposal_id = soa.proposal_ids[soa.proposal_idx[row]]
+                entry = (soa.user_ids[soa.user_idx[row]], vessel, powers[row])
+                vessels_by_proposal[proposal_id].append(entry)
+                if not hydro_mask[row]:
+                    user_vessels_by_proposal[proposal_id].append(entry)
+        else:
+            for user in scenario["users"]:
+                user_id = user["user_id"]
+                for vessel in user["vessels"]:
+                    proposal_id = vessel["voted_proposal_id"]
+                    if proposal_id is None:
+                        continue
+
+                    power = self.calculate_voting_power(vessel)
+                    entry = (user_id, vessel, power)
+                    vessels_by_proposal[proposal_id].append(entry)
+                    total_power_by_proposal[proposal_id] += power
+
+                    if vessel["controlled_by"] == "hydromancer":
+                        hydromancer_power_by_proposal[proposal_id] += power
+                    else:
+                        user_power_by_proposal[proposal_id] += power
+                        user_vessels_by_proposal[proposal_id].append(entry)
+
+        index = ScenarioIndex(
+            vessels_by_proposal=vessels_by_proposal,
+            hydromancer_power_by_proposal=hydromancer_power_by_proposal,
+            user_power_by_proposal=user_power_by_proposal,
+            total_power_by_proposal=total_power_by_proposal,
+            user_vessels_by_proposal=user_vessels_by_proposal,
+        )
+        self._index_cache[id(scenario)] = index
+        return index
+
+    def get_vessels_by_proposal(self, scenario: Dict[str, Any]) -> Dict[int, List[Tuple[str, Dict]]]:
+        """Group vessels by the proposal they voted for, as (user_id, vessel)
+        tuples — no per-vessel dict copy just to attach the owner."""
+        return {
+            proposal_id: [(user_id, vessel) for user_id, vessel, _power in entries]
+            for proposal_id, entries in self._index_scenario(scenario).vessels_by_proposal.items()
+        }
+
+    def _rates(self, scenario: Dict[str, Any]) -> CommissionRates:
+        """Parse the scenario-level commission rates out of protocol_config."""
+        config = scenario["protocol_config"]
+        protocol = self._num(config["protocol_commission_bps"]) / self._num(10000)
+        hydromancer = self._num(config["hydromancer_commission_bps"]) / self._num(10000)
+        return CommissionRates(
+            protocol=protocol,
+            hydromancer=hydromancer,
+            net_protocol=1 - protocol,
+            net_hydromancer=1 - hydromancer,
+        )
+
+    def calculate_protocol_rewards(self, scenario: Dict[str, Any],
+                                   rates: CommissionRates = None) -> Dict[str, Number]:
         """Calculate protocol rewards from commission on active proposals."""
-        protocol_commission_rate = Decimal(scenario["protocol_config"]["protocol_commission_bps"]) / Decimal("10000")
-        protocol_rewards = defaultdict(Decimal)
-        
-        vessels_by_proposal = self.get_vessels_by_proposal(scenario)
+        if rates is None:
+            rates = self._rates(scenario)
+        protocol_commission_rate = rates.protocol
+        protocol_rewards = defaultdict(self._num)
         
         # Only proposals with at least one vessel assigned generate rewards
-        active_proposal_ids = set(vessels_by_proposal.keys())
+        active_proposal_ids = set(self._index_scenario(scenario).vessels_by_proposal.keys())
         
         for proposal in scenario["proposals"]:
-            if proposal["id"] in active_proposal_ids:
+            if proposal["tributes"] and proposal["id"] in active_proposal_ids:
                 for tribute in proposal["tributes"]:
-                    tribute_amount = Decimal(tribute["amount"])
+                    tribute_amount = self._num(tribute["amount"])
                     commission = tribute_amount * protocol_commission_rate
                     protocol_rewards[tribute["denom"]] += commission
         
         return dict(protocol_rewards)
     
-    def calculate_hydromancer_voting_power_by_proposal(self, scenario: Dict[str, Any]) -> Dict[int, Decimal]:
+    def calculate_hydromancer_voting_power_by_proposal(self, scenario: Dict[str, Any]) -> Dict[int, Number]:
         """Calculate hydromancer's total voting power for each proposal."""
-        vessels_by_proposal = self.get_vessels_by_proposal(scenario)
-        hydromancer_power_by_proposal = {}
-        
-        for proposal_id, vessels in vessels_by_proposal.items():
-            hydromancer_power = Decimal("0")
-            for vessel in vessels:
-                if vessel["controlled_by"] == "hydromancer":
-                    hydromancer_power += self.calculate_voting_power(vessel)
-            hydromancer_power_by_proposal[proposal_id] = hydromancer_power
-        
-        return hydromancer_power_by_proposal
-    
-    def calculate_total_voting_power_by_proposal(self, scenario: Dict[str, Any]) -> Dict[int, Decimal]:
+        index = self._index_scenario(scenario)
+        return {
+            proposal_id: index.hydromancer_power_by_proposal.get(proposal_id, self._num(0))
+            for proposal_id in index.vessels_by_proposal
+        }
+
+    def calculate_total_voting_power_by_proposal(self, scenario: Dict[str, Any]) -> Dict[int, Number]:
         """Calculate total voting power for each proposal."""
-        vessels_by_proposal = self.get_vessels_by_proposal(scenario)
-        total_power_by_proposal = {}
-        
-        for proposal_id, vessels in vessels_by_proposal.items():
-            total_power = Decimal("0")
-            for vessel in vessels:
-                total_power += self.calculate_voting_power(vessel)
-            total_power_by_proposal[proposal_id] = total_power
-        
-        return total_power_by_proposal
+        return dict(self._index_scenario(scenario).total_power_by_proposal)
     
-    def calculate_hydromancer_rewards(self, scenario: Dict[str, Any]) -> Dict[str, Decimal]:
+    def calculate_hydromancer_rewards(self, scenario: Dict[str, Any],
+                                      rates: CommissionRates = None) -> Dict[str, Number]:
         """Calculate hydromancer rewards from commission on their voting power."""
-        hydromancer_commission_rate = Decimal(scenario["protocol_config"]["hydromancer_commission_bps"]) / Decimal("10000")
-        protocol_commission_rate = Decimal(scenario["protocol_config"]["protocol_commission_bps"]) / Decimal("10000")
-        
-        hydromancer_rewards = defaultdict(Decimal)
-        hydromancer_power_by_proposal = self.calculate_hydromancer_voting_power_by_proposal(scenario)
-        total_power_by_proposal = self.calculate_total_voting_power_by_proposal(scenario)
-        
+        if rates is None:
+            rates = self._rates(scenario)
+        hydromancer_commission_rate = rates.hydromancer
+        net_protocol = rates.net_protocol
+
+        hydromancer_rewards = defaultdict(self._num)
+        index = self._index_scenario(scenario)
+
         for proposal in scenario["proposals"]:
             proposal_id = proposal["id"]
-            
-            if (proposal_id in hydromancer_power_by_proposal and 
-                hydromancer_power_by_proposal[proposal_id] > 0):
-                
+
+            # Nothing to commission without tributes or hydromancer power
+            if not proposal["tributes"]:
+                continue
+
+            hydromancer_power = index.hydromancer_power_by_proposal.get(proposal_id)
+            if hydromancer_power:
+
                 # Calculate hydromancer's share of each tribute
-                hydromancer_power = hydromancer_power_by_proposal[proposal_id]
-                total_power = total_power_by_proposal[proposal_id]
+                total_power = index.total_power_by_proposal[proposal_id]
                 hydromancer_share = hydromancer_power / total_power
                 
                 for tribute in proposal["tributes"]:
-                    tribute_amount = Decimal(tribute["amount"])
+                    tribute_amount = self._num(tribute["amount"])
                     # Remove protocol commission first
-                    after_protocol_commission = tribute_amount * (Decimal("1") - protocol_commission_rate)
+                    after_protocol_commission = tribute_amount * net_protocol
                     # Hydromancer gets their share
                     hydromancer_tribute_share = after_protocol_commission * hydromancer_share
                     # Hydromancer takes commission from their share
@@ -132,109 +402,322 @@ class RewardsCalculator:
         
         return dict(hydromancer_rewards)
     
-    def calculate_user_direct_rewards(self, scenario: Dict[str, Any]) -> Dict[str, Dict[str, Decimal]]:
-        """Calculate rewards for users who vote directly (not through hydromancer)."""
-        protocol_commission_rate = Decimal(scenario["protocol_config"]["protocol_commission_bps"]) / Decimal("10000")
-        user_rewards = defaultdict(lambda: defaultdict(Decimal))
-        
-        vessels_by_proposal = self.get_vessels_by_proposal(scenario)
-        total_power_by_proposal = self.calculate_total_voting_power_by_proposal(scenario)
-        
-        for proposal in scenario["proposals"]:
-            proposal_id = proposal["id"]
-            
-            if proposal_id in vessels_by_proposal:
-                total_power = total_power_by_proposal[proposal_id]
-                
-                # Find user-controlled vessels for this proposal
-                user_vessels = [v for v in vessels_by_proposal[proposal_id] if v["controlled_by"] == "user"]
-                
-                for vessel in user_vessels:
-                    user_id = vessel["user_id"]
-                    vessel_power = self.calculate_voting_power(vessel)
-                    user_share = vessel_power / total_power
-                    
+    def calculate_user_direct_rewards(self, scenario: Dict[str, Any],
+                                      user_rewards: Dict = None,
+                                      rates: CommissionRates = None) -> Dict[Any, Dict[str, Number]]:
+        """Calculate rewards for users who vote directly (not through hydromancer).
+
+        Pass user_rewards to accumulate into an existing user -> denom ->
+        amount defaultdict instead of a fresh one."""
+        if rates is None:
+            rates = self._rates(scenario)
+        net_protocol = rates.net_protocol
+        if user_rewards is None:
+            user_rewards = defaultdict(lambda: defaultdict(self._num))
+
+        index = self._index_scenario(scenario)
+
+        if self._use_numpy:
+            # Accumulate into a dense (user, denom) matrix; the JIT kernel
+            # does the whole scatter in one compiled loop, otherwise each
+            # proposal contributes one np.add.at per tribute
+            soa = self._vectorize(scenario)
+            denom_ids = []
+            denom_pos = {}
+            for proposal in scenario["proposals"]:
+                for tribute in proposal["tributes"]:
+                    d = denom_pos.setdefault(tribute["denom"], len(denom_ids))
+                    if d == len(denom_ids):
+                        denom_ids.append(tribute["denom"])
+
+            out = np.zeros((len(soa.user_ids), len(denom_ids)))
+
+            if _direct_rewards_kernel is not None:
+                n_proposals = len(soa.proposal_ids)
+                total_power = np.bincount(soa.proposal_idx, weights=soa.power, minlength=n_proposals)
+                proposal_pos = {proposal_id: p for p, proposal_id in enumerate(soa.proposal_ids)}
+
+                # CSR layout: proposal p owns tribute rows offsets[p]..offsets[p+1]
+                tributes_by_pos = [[] for _ in range(n_proposals)]
+                for proposal in scenario["proposals"]:
+                    p = proposal_pos.get(proposal["id"])
+                    if p is None:
+                        continue
                     for tribute in proposal["tributes"]:
-                        tribute_amount = Decimal(tribute["amount"])
-                        # Remove protocol commission
-                        after_protocol_commission = tribute_amount * (Decimal("1") - protocol_commission_rate)
-                        user_reward = after_protocol_commission * user_share
-                        
-                        user_rewards[user_id][tribute["denom"]] += user_reward
-        
+                        tributes_by_pos[p].append((float(tribute["amount"]), denom_pos[tribute["denom"]]))
+
+                tribute_amount = []
+                tribute_denom = []
+                tribute_offsets = np.zeros(n_proposals + 1, dtype=np.int64)
+                for p, tributes in enumerate(tributes_by_pos):
+                    tribute_offsets[p + 1] = tribute_offsets[p] + len(tributes)
+                    for amount, d in tributes:
+                        tribute_amount.append(amount)
+                        tribute_denom.append(d)
+
+                user_mask = ~soa.is_hydromancer
+                _direct_rewards_kernel(
+                    soa.power[user_mask], soa.proposal_idx[user_mask], soa.user_idx[user_mask],
+                    total_power,
+                    np.array(tribute_amount, dtype=np.float64),
+                    np.array(tribute_denom, dtype=np.int64),
+                    tribute_offsets, net_protocol, out,
+                )
+            else:
+                for proposal in scenario["proposals"]:
+                    if not proposal["tributes"]:
+                        continue
+                    rows = soa.user_rows_by_proposal.get(proposal["id"])
+                    if rows is None:
+                        continue
+
+                    shares = soa.power[rows] / index.total_power_by_proposal[proposal["id"]]
+                    uidx = soa.user_idx[rows]
+                    for tribute in proposal["tributes"]:
+                        after_protocol_commission = float(tribute["amount"]) * net_protocol
+                        np.add.at(out[:, denom_pos[tribute["denom"]]], uidx, shares * after_protocol_commission)
+
+            # Mirror the interpreted path's entry set rather than np.nonzero:
+            # every user vessel on a tribute-bearing proposal yields an entry
+            # per tribute denom, even when the amount is exactly zero (e.g.
+            # under 100% protocol commission), so exact=True and the fast
+            # path stay structurally diffable
+            touched = np.zeros(out.shape, dtype=bool)
+            for proposal in scenario["proposals"]:
+                if not proposal["tributes"]:
+                    continue
+                rows = soa.user_rows_by_proposal.get(proposal["id"])
+                if rows is None or not index.total_power_by_proposal[proposal["id"]]:
+                    continue
+                cols = [denom_pos[tribute["denom"]] for tribute in proposal["tributes"]]
+                touched[np.ix_(soa.user_idx[rows], cols)] = True
+
+            for u, d in zip(*(idx.tolist() for idx in np.nonzero(touched))):
+                user_rewards[soa.user_ids[u]][denom_ids[d]] += out[u, d].item()
+        else:
+            for proposal in scenario["proposals"]:
+                proposal_id = proposal["id"]
+
+                if proposal["tributes"] and proposal_id in index.vessels_by_proposal:
+                    total_power = index.total_power_by_proposal[proposal_id]
+                    if not total_power:
+                        continue
+
+                    # Per-tribute amounts net of protocol commission are the same
+                    # for every vessel — compute them once per proposal
+                    tributes_after_protocol = [
+                        (tribute["denom"], self._num(tribute["amount"]) * net_protocol)
+                        for tribute in proposal["tributes"]
+                    ]
+
+                    # User-controlled vessels are pre-split in the index
+                    for user_id, _vessel, vessel_power in index.user_vessels_by_proposal.get(proposal_id, ()):
+                        user_share = vessel_power / total_power
+
+                        for denom, after_protocol_commission in tributes_after_protocol:
+                            user_reward = after_protocol_commission * user_share
+
+                            user_rewards[user_id][denom] += user_reward
+
         return {user_id: dict(rewards) for user_id, rewards in user_rewards.items()}
     
-    def calculate_user_delegated_rewards(self, scenario: Dict[str, Any]) -> Dict[str, Dict[str, Decimal]]:
-        """Calculate rewards for users who delegate to hydromancer."""
-        protocol_commission_rate = Decimal(scenario["protocol_config"]["protocol_commission_bps"]) / Decimal("10000")
-        hydromancer_commission_rate = Decimal(scenario["protocol_config"]["hydromancer_commission_bps"]) / Decimal("10000")
-        
-        user_rewards = defaultdict(lambda: defaultdict(Decimal))
-        
-        # Get all vessels controlled by hydromancer, grouped by user and eligible proposal duration
-        user_vessels_by_duration = defaultdict(lambda: defaultdict(list))
-        for user in scenario["users"]:
-            for vessel in user["vessels"]:
-                if vessel["controlled_by"] == "hydromancer":
-                    vessel_with_user = vessel.copy()
-                    vessel_with_user["user_id"] = user["user_id"]
-                    user_vessels_by_duration[user["user_id"]][vessel["lock_duration_rounds"]].append(vessel_with_user)
-        
+    def _eligibility_threshold(self, proposal_duration) -> Optional[int]:
+        """Smallest vessel-duration threshold that satisfies a proposal.
+
+        Vessel durations only take the threshold values, so a vessel is
+        eligible (duration >= proposal_duration) exactly when its duration is
+        at least the smallest threshold >= proposal_duration. Proposals longer
+        than every threshold have no eligible vessels (None)."""
+        for threshold in sorted(self.duration_multipliers):
+            if threshold >= proposal_duration:
+                return threshold
+        return None
+
+    def calculate_user_delegated_rewards(self, scenario: Dict[str, Any],
+                                         user_rewards: Dict = None,
+                                         rates: CommissionRates = None) -> Dict[Any, Dict[str, Number]]:
+        """Calculate rewards for users who delegate to hydromancer.
+
+        Pass user_rewards to accumulate into an existing user -> denom ->
+        amount defaultdict instead of a fresh one."""
+        if rates is None:
+            rates = self._rates(scenario)
+        net_protocol = rates.net_protocol
+        net_hydromancer = rates.net_hydromancer
+
+        if user_rewards is None:
+            user_rewards = defaultdict(lambda: defaultdict(self._num))
+
+        # Per-proposal aggregates are invariant across the proposal loop
+        index = self._index_scenario(scenario)
+
+        # Eligibility only depends on the proposal duration, and there are
+        # just three possible vessel durations — precompute each threshold's
+        # user power map once instead of rescanning every vessel per proposal;
+        # _eligibility_threshold maps arbitrary proposal durations onto it.
+        # Note eligibility covers every hydromancer-controlled vessel, voting
+        # or not, so this cannot reuse the voting-only SoA.
+        eligible_power_by_threshold = {}
+        total_eligible_power_by_threshold = {}
+
+        if self._use_numpy:
+            h_user_idx = []
+            h_durations = []
+            h_amounts = []
+            h_mults = []
+            user_ids = []
+            for user in scenario["users"]:
+                u = len(user_ids)
+                user_ids.append(user["user_id"])
+                for vessel in user["vessels"]:
+                    if vessel["controlled_by"] == "hydromancer":
+                        duration = vessel["lock_duration_rounds"]
+                        h_user_idx.append(u)
+                        h_durations.append(duration)
+                        h_amounts.append(float(vessel["locked_amount"]))
+                        h_mults.append(self._combined_multipliers[(vessel["locked_denom"], duration)])
+
+            h_power = np.array(h_amounts) * np.array(h_mults)
+            h_user_idx = np.array(h_user_idx, dtype=np.int64)
+            h_durations = np.array(h_durations, dtype=np.int64)
+
+            # Dense per-user share rows feed the JIT kernel; the dicts feed
+            # the interpreted fallback below
+            thresholds = sorted(self.duration_multipliers)
+            threshold_row = {threshold: k for k, threshold in enumerate(thresholds)}
+            user_share_by_threshold = np.zeros((len(thresholds), len(user_ids)))
+
+            for threshold in thresholds:
+                mask = h_durations >= threshold
+                per_user = np.bincount(h_user_idx[mask], weights=h_power[mask], minlength=len(user_ids))
+                total = h_power[mask].sum().item()
+                if total > 0:
+                    user_share_by_threshold[threshold_row[threshold]] = per_user / total
+                eligible_power_by_threshold[threshold] = {
+                    user_ids[u]: power for u, power in enumerate(per_user.tolist()) if power > 0
+                }
+                total_eligible_power_by_threshold[threshold] = total
+        else:
+            # Get all vessels controlled by hydromancer, grouped by user and eligible proposal duration
+            user_vessels_by_duration = defaultdict(lambda: defaultdict(list))
+            for user in scenario["users"]:
+                for vessel in user["vessels"]:
+                    if vessel["controlled_by"] == "hydromancer":
+                        user_vessels_by_duration[user["user_id"]][vessel["lock_duration_rounds"]].append(vessel)
+
+            for threshold in self.duration_multipliers:
+                threshold_user_power = {}
+                threshold_total = self._num(0)
+                for user_id, vessels_by_duration in user_vessels_by_duration.items():
+                    user_power = self._num(0)
+                    # Users can participate if their vessel duration >= proposal duration
+                    for duration, vessels in vessels_by_duration.items():
+                        if duration >= threshold:
+                            for vessel in vessels:
+                                user_power += self.calculate_voting_power(vessel)
+
+                    if user_power > 0:
+                        threshold_user_power[user_id] = user_power
+                        threshold_total += user_power
+                eligible_power_by_threshold[threshold] = threshold_user_power
+                total_eligible_power_by_threshold[threshold] = threshold_total
+
+        if self._use_numpy and _delegated_rewards_kernel is not None:
+            # Fold hydromancer share and both commissions into one factor per
+            # proposal and let the compiled kernel do the whole distribution
+            proposals = scenario["proposals"]
+            proposal_factor = np.zeros(len(proposals))
+            proposal_threshold_row = np.zeros(len(proposals), dtype=np.int64)
+            denom_ids = []
+            denom_pos = {}
+            tribute_amount = []
+            tribute_denom = []
+            tribute_proposal = []
+            touched_rows = []  # (threshold row, denom columns) per distributing proposal
+
+            for j, proposal in enumerate(proposals):
+                if not proposal["tributes"]:
+                    continue
+                hydromancer_power = index.hydromancer_power_by_proposal.get(proposal["id"])
+                if not hydromancer_power:
+                    continue
+                threshold = self._eligibility_threshold(proposal["bid_duration_months"])
+                if threshold is None or total_eligible_power_by_threshold[threshold] <= 0:
+                    continue
+
+                hydromancer_share = hydromancer_power / index.total_power_by_proposal[proposal["id"]]
+                proposal_factor[j] = hydromancer_share * net_protocol * net_hydromancer
+                proposal_threshold_row[j] = threshold_row[threshold]
+                cols = []
+                for tribute in proposal["tributes"]:
+                    d = denom_pos.setdefault(tribute["denom"], len(denom_ids))
+                    if d == len(denom_ids):
+                        denom_ids.append(tribute["denom"])
+                    tribute_amount.append(float(tribute["amount"]))
+                    tribute_denom.append(d)
+                    tribute_proposal.append(j)
+                    cols.append(d)
+                touched_rows.append((threshold_row[threshold], cols))
+
+            out = np.zeros((len(user_ids), len(denom_ids)))
+            _delegated_rewards_kernel(
+                np.array(tribute_amount, dtype=np.float64),
+                np.array(tribute_denom, dtype=np.int64),
+                np.array(tribute_proposal, dtype=np.int64),
+                proposal_factor, proposal_threshold_row,
+                user_share_by_threshold, out,
+            )
+
+            # Every eligible user gets an entry for each tribute denom of a
+            # distributing proposal even when the amount is exactly zero,
+            # matching the interpreted path's output structure
+            touched = np.zeros(out.shape, dtype=bool)
+            for k, cols in touched_rows:
+                touched[np.ix_(np.flatnonzero(user_share_by_threshold[k] > 0), cols)] = True
+
+            for u, d in zip(*(idx.tolist() for idx in np.nonzero(touched))):
+                user_rewards[user_ids[u]][denom_ids[d]] += out[u, d].item()
+
+            return {user_id: dict(rewards) for user_id, rewards in user_rewards.items()}
+
         # For each proposal, calculate rewards that should be shared among delegated users
         for proposal in scenario["proposals"]:
             proposal_duration = proposal["bid_duration_months"]
             proposal_id = proposal["id"]
-            
-            # Find hydromancer vessels that voted for this proposal
-            vessels_by_proposal = self.get_vessels_by_proposal(scenario)
-            if proposal_id not in vessels_by_proposal:
+
+            # Nothing to distribute without tributes
+            if not proposal["tributes"]:
                 continue
-                
-            hydromancer_vessels_for_proposal = [
-                v for v in vessels_by_proposal[proposal_id] 
-                if v["controlled_by"] == "hydromancer"
-            ]
-            
-            if not hydromancer_vessels_for_proposal:
+
+            # Total hydromancer voting power for this proposal; skip
+            # proposals with no hydromancer vessels
+            total_hydromancer_power_for_proposal = index.hydromancer_power_by_proposal.get(proposal_id)
+            if not total_hydromancer_power_for_proposal:
                 continue
-            
-            # Calculate total hydromancer voting power for this proposal
-            total_hydromancer_power_for_proposal = sum(
-                self.calculate_voting_power(vessel) for vessel in hydromancer_vessels_for_proposal
-            )
-            
+
             # Calculate hydromancer's share of total voting power
-            total_power_by_proposal = self.calculate_total_voting_power_by_proposal(scenario)
-            total_power = total_power_by_proposal[proposal_id]
+            total_power = index.total_power_by_proposal[proposal_id]
             hydromancer_share = total_hydromancer_power_for_proposal / total_power
             
-            # Calculate eligible user voting power for this proposal duration
-            eligible_user_power = defaultdict(Decimal)
-            total_eligible_power = Decimal("0")
-            
-            for user_id, vessels_by_duration in user_vessels_by_duration.items():
-                user_power = Decimal("0")
-                # Users can participate if their vessel duration >= proposal duration
-                for duration, vessels in vessels_by_duration.items():
-                    if duration >= proposal_duration:
-                        for vessel in vessels:
-                            user_power += self.calculate_voting_power(vessel)
-                
-                if user_power > 0:
-                    eligible_user_power[user_id] = user_power
-                    total_eligible_power += user_power
-            
+            # Eligible user voting power for this proposal duration
+            threshold = self._eligibility_threshold(proposal_duration)
+            if threshold is None:
+                continue
+            eligible_user_power = eligible_power_by_threshold[threshold]
+            total_eligible_power = total_eligible_power_by_threshold[threshold]
+
+
             if total_eligible_power > 0:
                 # Distribute hydromancer's tribute share among eligible users
                 for tribute in proposal["tributes"]:
-                    tribute_amount = Decimal(tribute["amount"])
+                    tribute_amount = self._num(tribute["amount"])
                     # Remove protocol commission
-                    after_protocol_commission = tribute_amount * (Decimal("1") - protocol_commission_rate)
+                    after_protocol_commission = tribute_amount * net_protocol
                     # Get hydromancer's share
                     hydromancer_tribute_share = after_protocol_commission * hydromancer_share
                     # Remove hydromancer commission
-                    after_hydromancer_commission = hydromancer_tribute_share * (Decimal("1") - hydromancer_commission_rate)
-                    
+                    after_hydromancer_commission = hydromancer_tribute_share * net_hydromancer
+
                     # Distribute among eligible users based on their voting power
                     for user_id, user_power in eligible_user_power.items():
                         user_share = user_power / total_eligible_power
@@ -243,49 +726,60 @@ class RewardsCalculator:
         
         return {user_id: dict(rewards) for user_id, rewards in user_rewards.items()}
     
+    def _format_amount(self, amount) -> str:
+        """Round an accumulated amount to 2 decimals (half-up) for JSON output.
+
+        Floats are rounded via integer cents, which avoids a Decimal
+        construction and quantize per output entry; Decimal amounts (and the
+        negative edge case) quantize against the shared _CENT quantum."""
+        if not isinstance(amount, Decimal):
+            if amount >= 0:
+                cents = int(amount * 100 + 0.5)
+                return f"{cents // 100}.{cents % 100:02d}"
+            amount = Decimal(repr(amount))
+        return str(amount.quantize(_CENT, rounding=ROUND_HALF_UP))
+
     def calculate_all_rewards(self, scenario: Dict[str, Any]) -> Dict[str, Any]:
         """Calculate all rewards for the scenario."""
-        
+
+        # Invalidate per-scenario caches so a mutated or reused scenario
+        # object never serves stale results
+        self._index_cache.clear()
+        self._soa_cache.clear()
+        self._vp_cache.clear()
+
+        # Commission rates are scenario-level constants — parse them once
+        rates = self._rates(scenario)
+
         # Calculate protocol rewards
-        protocol_rewards = self.calculate_protocol_rewards(scenario)
-        
+        protocol_rewards = self.calculate_protocol_rewards(scenario, rates=rates)
+
         # Calculate hydromancer rewards
-        hydromancer_rewards = self.calculate_hydromancer_rewards(scenario)
-        
-        # Calculate user direct rewards
-        user_direct_rewards = self.calculate_user_direct_rewards(scenario)
-        
-        # Calculate user delegated rewards
-        user_delegated_rewards = self.calculate_user_delegated_rewards(scenario)
-        
-        # Combine user rewards
-        all_user_rewards = defaultdict(lambda: defaultdict(Decimal))
-        
-        # Add direct rewards
-        for user_id, rewards in user_direct_rewards.items():
-            for denom, amount in rewards.items():
-                all_user_rewards[user_id][denom] += amount
-        
-        # Add delegated rewards
-        for user_id, rewards in user_delegated_rewards.items():
-            for denom, amount in rewards.items():
-                all_user_rewards[user_id][denom] += amount
-        
-        # Convert to regular dict with string amounts for JSON serialization
+        hydromancer_rewards = self.calculate_hydromancer_rewards(scenario, rates=rates)
+
+        # Direct and delegated user rewards accumulate into one shared dict,
+        # so no separate combining pass is needed
+        all_user_rewards = defaultdict(lambda: defaultdict(self._num))
+        self.calculate_user_direct_rewards(scenario, user_rewards=all_user_rewards, rates=rates)
+        self.calculate_user_delegated_rewards(scenario, user_rewards=all_user_rewards, rates=rates)
+
+        # Convert to regular dict with string keys and amounts for JSON
+        # serialization; internally user ids stay whatever the scenario uses
+        # (the generator emits integers)
         final_user_rewards = {}
         for user_id, rewards in all_user_rewards.items():
-            final_user_rewards[user_id] = {
-                denom: str(amount.quantize(Decimal('0.01'), rounding=ROUND_HALF_UP))
+            final_user_rewards[str(user_id)] = {
+                denom: self._format_amount(amount)
                 for denom, amount in rewards.items()
             }
         
         return {
             "protocol_rewards": {
-                denom: str(amount.quantize(Decimal('0.01'), rounding=ROUND_HALF_UP))
+                denom: self._format_amount(amount)
                 for denom, amount in protocol_rewards.items()
             },
             "hydromancer_rewards": {
-                denom: str(amount.quantize(Decimal('0.01'), rounding=ROUND_HALF_UP))
+                denom: self._format_amount(amount)
                 for denom, amount in hydromancer_rewards.items()
             },
             "user_rewards": final_user_rewards
@@ -293,14 +787,22 @@ class RewardsCalculator:
     
     def calculate_rewards_from_file(self, filename: str) -> Dict[str, Any]:
         """Load scenario from file and calculate rewards."""
-        with open(filename, 'r') as f:
-            scenario = json.load(f)
+        if orjson is not None:
+            with open(filename, 'rb') as f:
+                scenario = orjson.loads(f.read())
+        else:
+            with open(filename, 'r') as f:
+                scenario = json.load(f)
         return self.calculate_all_rewards(scenario)
-    
+
     def save_rewards_calculation(self, rewards: Dict[str, Any], filename: str) -> None:
         """Save rewards calculation to file."""
-        with open(filename, 'w') as f:
-            json.dump(rewards, f, indent=4)
+        if orjson is not None:
+            with open(filename, 'wb') as f:
+                f.write(orjson.dumps(rewards, option=orjson.OPT_INDENT_2))
+        else:
+            with open(filename, 'w') as f:
+                json.dump(rewards, f, indent=4)
 
 
 # Example usage and testing
@@ -1,7 +1,19 @@
 import json
 import random
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from typing import List, Dict, Any, Optional
 
+try:
+    import numpy as np
+except ImportError:  # generation falls back to the stdlib random module
+    np = None
+
+try:
+    import orjson
+except ImportError:  # stdlib json is the (slower) fallback
+    orjson = None
+
 class ScenarioGenerator:
     def __init__(self):
         # Available token denominations for vessels (locked tokens)
@@ -19,37 +31,81 @@ class ScenarioGenerator:
         # Default commission rates (in basis points)
         self.default_protocol_commission_bps = 1000
         self.default_hydromancer_commission_bps = 500
-    
-    def generate_vessel(self, vessel_id: int, user_id: str, total_rounds: int) -> Dict[str, Any]:
+
+        # Bulk-drawn randomness, filled per scenario when NumPy is present.
+        # One vectorized draw per attribute replaces a random.* call per
+        # vessel (or per vessel-round); the loops just consume the iterators.
+        self._rng = np.random.default_rng() if np is not None else None
+        self._vessel_draws = None
+        self._round_draws = None
+        self._vote_draws = None
+
+    def _predraw(self, total_vessels: int, total_rounds: int) -> None:
+        """Draw every per-vessel and per-vessel-round random value for one
+        scenario in a handful of vectorized calls."""
+        rng = self._rng
+        total_vessel_rounds = total_vessels * total_rounds
+
+        # (lock_duration, locked_denom, locked_amount, initial_controller)
+        self._vessel_draws = iter(zip(
+            rng.choice(self.durations, size=total_vessels).tolist(),
+            rng.choice(self.vessel_token_denoms, size=total_vessels).tolist(),
+            rng.integers(10, 1000, size=total_vessels).tolist(),
+            rng.choice(self.controllers, size=total_vessels).tolist(),
+        ))
+        # (refresh, switch_controller) per round state
+        self._round_draws = iter(zip(
+            (rng.random(total_vessel_rounds) < 0.5).tolist(),
+            (rng.random(total_vessel_rounds) < 0.2).tolist(),
+        ))
+        # (vote_roll, pick_roll) per round state for proposal assignment
+        self._vote_draws = iter(zip(
+            rng.random(total_vessel_rounds).tolist(),
+            rng.random(total_vessel_rounds).tolist(),
+        ))
+
+    def generate_vessel(self, vessel_id: int, user_id: int, total_rounds: int) -> Dict[str, Any]:
         """Generate a single vessel with random properties and round states."""
-        initial_controller = random.choice(self.controllers)
-        
+        if self._vessel_draws is not None:
+            lock_duration, locked_denom, locked_amount, initial_controller = next(self._vessel_draws)
+        else:
+            initial_controller = random.choice(self.controllers)
+            lock_duration = random.choice(self.durations)
+            locked_denom = random.choice(self.vessel_token_denoms)  # Only stATOM or dATOM
+            locked_amount = random.randint(10, 999)
+
         # Generate round states for each round
         rounds = []
         current_controller = initial_controller
-        
+
         for round_id in range(total_rounds):
+            if self._round_draws is not None:
+                refresh, switch_controller = next(self._round_draws)
+            else:
+                refresh = random.choice([True, False])  # Random refresh setting
+                # Randomly change controller between rounds (20% chance)
+                switch_controller = random.random() < 0.2
+
             round_state = {
                 "round_id": round_id,
                 "controlled_by": current_controller,
                 "voted_proposal_id": None,  # Will be assigned later
-                "refresh": random.choice([True, False])  # Random refresh setting
+                "refresh": refresh
             }
             rounds.append(round_state)
-            
-            # Randomly change controller between rounds (20% chance)
-            if random.random() < 0.2:
+
+            if switch_controller:
                 current_controller = "user" if current_controller == "hydromancer" else "hydromancer"
-        
+
         return {
             "id": vessel_id,
-            "lock_duration_rounds": random.choice(self.durations),
-            "locked_denom": random.choice(self.vessel_token_denoms),  # Only stATOM or dATOM
-            "locked_amount": str(random.randint(10, 999)),
+            "lock_duration_rounds": lock_duration,
+            "locked_denom": locked_denom,
+            "locked_amount": str(locked_amount),
             "rounds": rounds
         }
     
-    def generate_user(self, user_id: str, vessel_count: int, starting_vessel_id: int, total_rounds: int) -> tuple:
+    def generate_user(self, user_id: int, vessel_count: int, starting_vessel_id: int, total_rounds: int) -> tuple:
         """Generate a user with specified number of vessels."""
         vessels = []
         for i in range(vessel_count):
@@ -91,33 +147,44 @@ class ScenarioGenerator:
     
     def assign_vessels_to_proposals(self, users: List[Dict], proposals: List[Dict]) -> None:
         """Assign vessels to proposals respecting duration constraints."""
+        # Group proposals by round once instead of rescanning the full list
+        # for every (vessel, round) pair
+        proposals_by_round = defaultdict(list)
+        for proposal in proposals:
+            proposals_by_round[proposal["round_id"]].append(proposal)
+
         for user in users:
             for vessel in user["vessels"]:
                 for round_state in vessel["rounds"]:
                     round_id = round_state["round_id"]
                     controlled_by = round_state["controlled_by"]
-                    
+
+                    if self._vote_draws is not None:
+                        vote_roll, pick_roll = next(self._vote_draws)
+                    else:
+                        vote_roll = pick_roll = None
+
                     # Find proposals for this round
-                    round_proposals = [p for p in proposals if p["round_id"] == round_id]
-                    
+                    round_proposals = proposals_by_round.get(round_id, ())
+
                     # Only consider proposals with bid_duration <= vessel lock_duration
                     eligible_proposals = [
-                        p for p in round_proposals 
+                        p for p in round_proposals
                         if p["bid_duration_months"] <= vessel["lock_duration_rounds"]
                     ]
-                    
+
                     if eligible_proposals:
-                        # Different probabilities based on controller
-                        if controlled_by == "hydromancer":
-                            # 70% chance for hydromancer-controlled vessels
-                            if random.random() < 0.7:
-                                chosen_proposal = random.choice(eligible_proposals)
-                                round_state["voted_proposal_id"] = chosen_proposal["id"]
-                        else:  # user controlled
-                            # 40% chance for user-controlled vessels
-                            if random.random() < 0.4:
+                        # Different probabilities based on controller:
+                        # 70% chance for hydromancer-controlled vessels,
+                        # 40% for user-controlled ones
+                        vote_chance = 0.7 if controlled_by == "hydromancer" else 0.4
+                        if vote_roll is None:
+                            if random.random() < vote_chance:
                                 chosen_proposal = random.choice(eligible_proposals)
                                 round_state["voted_proposal_id"] = chosen_proposal["id"]
+                        elif vote_roll < vote_chance:
+                            chosen_proposal = eligible_proposals[int(pick_roll * len(eligible_proposals))]
+                            round_state["voted_proposal_id"] = chosen_proposal["id"]
     
     def generate_scenario(self, 
                          num_users: int = 2,
@@ -155,13 +222,21 @@ class ScenarioGenerator:
             "total_rounds": total_rounds
         }
         
-        # Generate users
+        # Generate users; ids stay integers in memory (cheaper dict keys)
+        # and are stringified when the scenario is saved
         users = []
         current_vessel_id = 0
-        user_ids = [str(i) for i in range(num_users)]  # 0, 1, 2, ...
-        
-        for user_id in user_ids:
-            vessel_count = random.randint(*vessels_per_user_range)
+        user_ids = list(range(num_users))  # 0, 1, 2, ...
+
+        if self._rng is not None:
+            vessel_counts = self._rng.integers(
+                vessels_per_user_range[0], vessels_per_user_range[1] + 1, size=num_users
+            ).tolist()
+            self._predraw(sum(vessel_counts), total_rounds)
+        else:
+            vessel_counts = [random.randint(*vessels_per_user_range) for _ in user_ids]
+
+        for user_id, vessel_count in zip(user_ids, vessel_counts):
             user, current_vessel_id = self.generate_user(user_id, vessel_count, current_vessel_id, total_rounds)
             users.append(user)
         
@@ -181,31 +256,66 @@ class ScenarioGenerator:
         
         # Assign vessels to proposals
         self.assign_vessels_to_proposals(users, proposals)
-        
+
+        # Drop the exhausted draw iterators so a standalone
+        # assign_vessels_to_proposals call falls back to random.*
+        self._vessel_draws = None
+        self._round_draws = None
+        self._vote_draws = None
+
         return {
             "protocol_config": protocol_config,
             "users": users,
             "proposals": proposals
         }
     
-    def generate_multiple_scenarios(self, count: int, **kwargs) -> List[Dict[str, Any]]:
-        """Generate multiple scenarios."""
-        scenarios = []
-        for i in range(count):
-            scenario = self.generate_scenario(**kwargs)
-            scenarios.append(scenario)
-        return scenarios
+    def _generate_seeded(self, task: tuple) -> Dict[str, Any]:
+        """Worker entry point: reseed this process's RNGs, then generate."""
+        seed, kwargs = task
+        random.seed(seed)
+        if np is not None:
+            self._rng = np.random.default_rng(seed)
+        return self.generate_scenario(**kwargs)
+
+    def generate_multiple_scenarios(self, count: int, base_seed: int = None,
+                                    max_workers: int = None, **kwargs) -> List[Dict[str, Any]]:
+        """Generate multiple scenarios, in parallel when count warrants it.
+
+        Scenarios are independent and CPU-bound, so they fan out over a
+        process pool. Each worker task is seeded with base_seed + i (a
+        random base when none is given), which keeps runs with the same
+        base_seed reproducible regardless of worker scheduling."""
+        if base_seed is None:
+            base_seed = random.randrange(2**32)
+        tasks = [(base_seed + i, kwargs) for i in range(count)]
+
+        if count <= 1:
+            return [self._generate_seeded(task) for task in tasks]
+
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            return list(executor.map(self._generate_seeded, tasks))
     
     def save_scenario(self, scenario: Dict[str, Any], filename: str) -> None:
-        """Save a scenario to a JSON file."""
-        with open(filename, 'w') as f:
-            json.dump(scenario, f, indent=4)
+        """Save a scenario to a JSON file (user ids serialize as strings)."""
+        scenario = {
+            **scenario,
+            "users": [{**user, "user_id": str(user["user_id"])} for user in scenario["users"]],
+        }
+        if orjson is not None:
+            with open(filename, 'wb') as f:
+                f.write(orjson.dumps(scenario, option=orjson.OPT_INDENT_2))
+        else:
+            with open(filename, 'w') as f:
+                json.dump(scenario, f, indent=4)
     
     def save_scenarios(self, scenarios: List[Dict[str, Any]], filename_prefix: str) -> None:
-        """Save multiple scenarios to separate JSON files."""
-        for i, scenario in enumerate(scenarios, 1):
-            filename = f"{filename_prefix}-{i}.json"
-            self.save_scenario(scenario, filename)
+        """Save multiple scenarios to separate JSON files (writes in parallel)."""
+        def write(item):
+            i, scenario = item
+            self.save_scenario(scenario, f"{filename_prefix}-{i}.json")
+
+        with ThreadPoolExecutor() as executor:
+            list(executor.map(write, enumerate(scenarios, 1)))
 
 
 # Example usage